@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
+# Interpreter selection is the caller's job: the backend spawns this script
+# with NALOGO_BRIDGE_BIN (default python3), so the bridge never re-execs
+# itself into a different interpreter.
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import json
 import os
 import re
+import reprlib
 import socket
 import sys
 import time
@@ -16,26 +21,81 @@ from urllib.parse import parse_qs, unquote, urlparse
 # Keep bridge output deterministic (JSON only) and avoid noisy deprecated warnings.
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Keys checked first (in order) when walking provider payloads for a UUID.
+_PRIORITY_KEYS = (
+    "id",
+    "approvedReceiptUuid",
+    "receiptUuid",
+    "uuid",
+    "receiptUrl",
+    "printUrl",
+    "url",
+    "link",
+)
+
+_RECEIPT_ANY = re.compile(r"/receipt/([^/]+?)(?:/|$)")
+_TOKEN_8 = re.compile(r"[A-Za-z0-9_-]{8,}")
+
+# Bounded repr for error snippets: caps traversal up front instead of
+# materializing the full str() of a large payload and slicing afterwards.
+_SNIP = reprlib.Repr()
+_SNIP.maxstring = 350
+_SNIP.maxother = 350
+
+_AUTH_RE = re.compile(r"невер|wrong password|invalid password|invalid credentials|unauthorized|auth failed|401")
+_RATE_RE = re.compile(r"429|too many|rate limit")
+_NET_RE = re.compile(r"timeout|timed out|connect|connection|network|socket|proxy")
+
+
+def _dumps_bytes(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def emit(payload: dict[str, Any], code: int) -> None:
-    sys.stdout.write(json.dumps(payload, ensure_ascii=False))
-    sys.stdout.flush()
+    # Write bytes straight to the underlying buffer; orjson already produces
+    # UTF-8 and the text wrapper would only re-encode.
+    sys.stdout.buffer.write(_dumps_bytes(payload))
+    sys.stdout.buffer.flush()
     raise SystemExit(code)
 
 
+def _clean(value: Any) -> str:
+    # Payload fields are normally plain strings already; avoid the str() cast
+    # allocation for that common case.
+    if type(value) is str:
+        return value.strip()
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
 def extract_uuid(value: Any) -> str | None:
-    if not isinstance(value, str):
+    if type(value) is not str:
         return None
     s = value.strip()
     if not s:
         return None
-    m = re.search(r"/receipt/([^/]+)/", s)
-    if m:
-        return m.group(1)
-    m = re.search(r"/receipt/([^/]+)$", s)
-    if m:
-        return m.group(1)
-    if re.fullmatch(r"[A-Za-z0-9_-]{8,}", s):
+    # Single find() doubles as the cheap pre-check and the anchor for the
+    # regex, so the prefix before /receipt/ is never rescanned.
+    idx = s.find("/receipt/")
+    if idx >= 0:
+        m = _RECEIPT_ANY.search(s, idx)
+        if m:
+            return m.group(1)
+    if _TOKEN_8.fullmatch(s):
         return s
     return None
 
@@ -70,60 +130,43 @@ def to_plain(value: Any) -> Any:
 
 
 def find_uuid_deep(value: Any) -> str | None:
-    direct = extract_uuid(value)
-    if direct:
-        return direct
-    if isinstance(value, dict):
-        for key in (
-            "id",
-            "approvedReceiptUuid",
-            "receiptUuid",
-            "uuid",
-            "receiptUrl",
-            "printUrl",
-            "url",
-            "link",
-        ):
-            if key in value:
-                found = find_uuid_deep(value[key])
-                if found:
-                    return found
-        for nested in value.values():
-            found = find_uuid_deep(nested)
-            if found:
-                return found
-        return None
-    if isinstance(value, list):
-        for item in value:
-            found = find_uuid_deep(item)
-            if found:
-                return found
+    # Explicit DFS stack instead of recursion: no frame allocation per node
+    # and no RecursionError risk on deeply nested provider responses.
+    # Bind the hot callables once so the loop skips repeated LOAD_ATTR/
+    # LOAD_GLOBAL lookups per node.
+    stack = [value]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        current = pop()
+        # to_plain guarantees exact builtin types here, so dispatch on type
+        # identity; non-string scalars (ints, None, bools) skip extract_uuid
+        # entirely.
+        t = type(current)
+        if t is str:
+            direct = extract_uuid(current)
+            if direct:
+                return direct
+        elif t is dict:
+            # Priority keys are visited before the rest, so push them last.
+            ordered: list[Any] = []
+            for key in _PRIORITY_KEYS:
+                if key in current:
+                    ordered.append(current[key])
+            ordered.extend(current.values())
+            push(reversed(ordered))
+        elif t is list:
+            push(reversed(current))
     return None
 
 
 def classify_error(message: str) -> tuple[int, bool]:
     msg = message.lower()
-    if (
-        "невер" in msg
-        or "wrong password" in msg
-        or "invalid password" in msg
-        or "invalid credentials" in msg
-        or "unauthorized" in msg
-        or "auth failed" in msg
-        or "401" in msg
-    ):
+    if _AUTH_RE.search(msg):
         return 401, False
-    if "429" in msg or "too many" in msg or "rate limit" in msg:
+    if _RATE_RE.search(msg):
         return 429, True
-    if (
-        "timeout" in msg
-        or "timed out" in msg
-        or "connect" in msg
-        or "connection" in msg
-        or "network" in msg
-        or "socket" in msg
-        or "proxy" in msg
-    ):
+    if _NET_RE.search(msg):
         return 504, True
     return 502, True
 
@@ -184,11 +227,9 @@ def parse_proxy_url(raw: str) -> tuple[str, int, str | None, str | None] | None:
 
 
 def apply_socks_proxy_from_env() -> None:
-    raw_proxy = (os.getenv("NALOGO_PROXY_URL") or "").strip()
-    if not raw_proxy:
-        return
-
-    proxy = parse_proxy_url(raw_proxy)
+    # parse_proxy_url normalizes and rejects empty values itself; no need to
+    # strip/validate the raw env value twice.
+    proxy = parse_proxy_url(os.getenv("NALOGO_PROXY_URL") or "")
     if proxy is None:
         return
     host, port, user, password = proxy
@@ -209,6 +250,22 @@ def apply_socks_proxy_from_env() -> None:
     socket.socket = socks.socksocket  # type: ignore[assignment]
 
 
+def ensure_nalogapi_available() -> None:
+    # find_spec only consults the import machinery (no module body execution),
+    # so a missing dependency fails fast instead of eating the retry/backoff
+    # loop on an unrecoverable ImportError.
+    if importlib.util.find_spec("nalogapi") is None:
+        emit(
+            {
+                "ok": False,
+                "error": "nalogapi is not installed in the bridge environment",
+                "status": 500,
+                "retryable": False,
+            },
+            1,
+        )
+
+
 def should_try_nalogovich_fallback(exc: Exception) -> bool:
     # `nalogapi` often crashes with KeyError('refreshToken') on unstable auth responses.
     # In such case we can transparently fallback to nalogovich.
@@ -278,17 +335,19 @@ def run() -> None:
             1,
         )
 
-    raw = sys.stdin.read()
+    # Read raw bytes: skips the TextIOWrapper decode and lets orjson parse
+    # UTF-8 directly.
+    raw = sys.stdin.buffer.read()
     if not raw.strip():
         emit({"ok": False, "error": "empty input", "status": 400, "retryable": False}, 1)
     try:
-        payload = json.loads(raw)
+        payload = _loads(raw)
     except Exception:
         emit({"ok": False, "error": "invalid json input", "status": 400, "retryable": False}, 1)
 
-    inn = str(payload.get("inn", "")).strip()
-    password = str(payload.get("password", "")).strip()
-    mode = str(payload.get("mode", "income")).strip().lower()
+    inn = _clean(payload.get("inn"))
+    password = _clean(payload.get("password"))
+    mode = _clean(payload.get("mode", "income")).lower()
     if not inn or not password:
         emit({"ok": False, "error": "missing inn/password", "status": 400, "retryable": False}, 1)
     if mode not in ("income", "auth"):
@@ -299,7 +358,7 @@ def run() -> None:
     auth_timeout_s = read_env_timeout_seconds("NALOGO_BRIDGE_PY_AUTH_TIMEOUT_MS", 20_000, 3_000, 120_000)
     create_timeout_s = read_env_timeout_seconds("NALOGO_BRIDGE_PY_CREATE_TIMEOUT_MS", 35_000, 3_000, 180_000)
 
-    name = str(payload.get("name", "")).strip()
+    name = _clean(payload.get("name"))
     amount_raw = payload.get("amountRub")
 
     if mode == "income":
@@ -314,6 +373,8 @@ def run() -> None:
     else:
         amount_value = 0.0
 
+    ensure_nalogapi_available()
+
     last_error_payload: dict[str, Any] | None = None
 
     for attempt in range(1, attempts + 1):
@@ -349,9 +410,9 @@ def run() -> None:
 
             plain = to_plain(receipt)
             receipt_url = None
-            if isinstance(plain, str) and plain.strip():
+            if type(plain) is str and plain.strip():
                 receipt_url = plain.strip()
-            elif isinstance(plain, dict):
+            elif type(plain) is dict:
                 raw_url = (
                     plain.get("printUrl")
                     or plain.get("print_url")
@@ -359,7 +420,7 @@ def run() -> None:
                     or plain.get("url")
                     or plain.get("link")
                 )
-                if isinstance(raw_url, str) and raw_url.strip():
+                if type(raw_url) is str and raw_url.strip():
                     receipt_url = raw_url.strip()
 
             receipt_uuid = find_uuid_deep(plain)
@@ -367,9 +428,7 @@ def run() -> None:
                 receipt_uuid = extract_uuid(receipt_url)
 
             if not receipt_uuid:
-                snippet = str(plain)
-                if len(snippet) > 350:
-                    snippet = snippet[:350] + "..."
+                snippet = _SNIP.repr(plain)
                 emit(
                     {
                         "ok": False,
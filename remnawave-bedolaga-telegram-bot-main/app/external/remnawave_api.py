@@ -11,10 +11,21 @@ from urllib.parse import urlparse
 import aiohttp
 import structlog
 
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
 
 logger = structlog.get_logger(__name__)
 
 
+def _parse_iso_datetime(date_str: str) -> datetime:
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(date_str)
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
+
 class UserStatus(Enum):
     ACTIVE = 'ACTIVE'
     DISABLED = 'DISABLED'
@@ -1160,7 +1171,7 @@ class RemnaWaveAPI:
             status=status,
             traffic_limit_bytes=user_data.get('trafficLimitBytes', 0),
             traffic_limit_strategy=traffic_strategy,
-            expire_at=datetime.fromisoformat(user_data['expireAt'].replace('Z', '+00:00')),
+            expire_at=_parse_iso_datetime(user_data['expireAt']),
             telegram_id=user_data.get('telegramId'),
             email=user_data.get('email'),
             hwid_device_limit=user_data.get('hwidDeviceLimit'),
@@ -1168,8 +1179,8 @@ class RemnaWaveAPI:
             tag=user_data.get('tag'),
             subscription_url=user_data.get('subscriptionUrl', ''),
             active_internal_squads=user_data.get('activeInternalSquads', []),
-            created_at=datetime.fromisoformat(user_data['createdAt'].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(user_data['updatedAt'].replace('Z', '+00:00')),
+            created_at=_parse_iso_datetime(user_data['createdAt']),
+            updated_at=_parse_iso_datetime(user_data['updatedAt']),
             user_traffic=user_traffic,
             sub_last_user_agent=user_data.get('subLastUserAgent'),
             sub_last_opened_at=self._parse_optional_datetime(user_data.get('subLastOpenedAt')),
@@ -1187,7 +1198,7 @@ class RemnaWaveAPI:
 
     def _parse_optional_datetime(self, date_str: str | None) -> datetime | None:
         if date_str:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            return _parse_iso_datetime(date_str)
         return None
 
     def _parse_inbound(self, inbound_data: dict) -> RemnaWaveInbound: